@@ -1,12 +1,73 @@
 from __future__ import annotations
-import os, time, re
+import os, time, re, threading
 from pathlib import Path
-from typing import List, Dict, Optional
+from typing import Any, List, Dict, Optional, Tuple
 import logging, requests
 import traceback
+from concurrent.futures import ThreadPoolExecutor
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+try:
+    import orjson
+except ImportError:
+    orjson = None
 
 log = logging.getLogger(__name__)
 
+# sites that only make sense to crawl at page scope
+_PAGE_SCOPE_RE = re.compile(r"https?://(www\.)?(facebook|twitter|discord|x|instagram|linkedin|pinterest|tiktok|youtube|play.google)(\.com)?")
+_URL_PARAMS_RE = re.compile(r"\?.+=.+")
+# tokens rewritten when turning a seed URL into its include regex, in one pass
+_INCLUDE_TOKEN_RE = re.compile(r"^https?|www\.|\.")
+_INCLUDE_SUBS = {".": r"\.", "www.": r"(www\.)?"}
+
+def _json(resp: requests.Response):
+    """Decode a JSON response body, with orjson when available."""
+    if orjson is None:
+        return resp.json()
+    return orjson.loads(resp.content)
+
+# Browsertrix crawl state -> job status
+_STATE_MAP = {
+    "PAUSED": "STOPPED",
+    "PAUSED_STORAGE_QUOTA_REACHED": "STOPPED",
+    "PAUSED_TIME_QUOTA_REACHED": "STOPPED",
+    "PAUSED_ORG_READONLY": "STOPPED",
+    "STARTING": "RUNNING",
+    "WAITING_CAPACITY": "RUNNING",
+    "WAITING_ORG_LIMIT": "RUNNING",
+    "WAITING_DEDUPE_INDEX": "RUNNING",
+    "RUNNING": "RUNNING",
+    "PENDING-WAIT": "RUNNING",
+    "GENERATE-WACZ": "RUNNING",
+    "UPLOADING-WACZ": "RUNNING",
+    "CANCELED": "CANCELED",
+    "FAILED": "FAILED",
+    "FAILED_NOT_LOGGED_IN": "FAILED",
+    "SKIPPED_STORAGE_QUOTA_REACHED": "STOPPED",
+    "SKIPPED_TIME_QUOTA_REACHED": "STOPPED",
+    "COMPLETE": "FINISHED",
+    "STOPPED_BY_USER": "STOPPED",
+    "STOPPED_PAUSE_EXPIRED": "STOPPED",
+    "STOPPED_STORAGE_QUOTA_REACHED": "STOPPED",
+    "STOPPED_TIME_QUOTA_REACHED": "STOPPED",
+    "STOPPED_ORG_READONLY": "STOPPED"
+}
+
+# concurrent API calls for batch operations, kept below the session pool size
+FAN_OUT_WORKERS = 8
+POOL_MAXSIZE = 32
+# from this many jobs on, statuses are read from one crawlconfig listing
+BULK_STATUS_MIN = 5
+
+class _Flight:
+    """A GET in flight: followers wait on the event, then read the leader's result."""
+    __slots__ = ("event", "result")
+
+    def __init__(self):
+        self.event = threading.Event()
+        self.result: Any = None
+
 class BrowsertrixClient:
     """refer to https://docs.browsertrix.com/api/"""
     def __init__(self, base_url: str, username: str, password: str, org: str = "", collection: str = ""):
@@ -19,6 +80,30 @@ class BrowsertrixClient:
         self.collection_id: str = ""
         self.token: Optional[str] = None
         self.headers: Dict[str, str] = {}
+        # keep-alive connection pool shared by all API calls
+        self.sess = requests.Session()
+        # transient throttling/5xx are retried with backoff at the adapter level;
+        # the final response still goes through _request's error handling.
+        # Only idempotent methods: a POST (create/run/delete crawls) that failed after
+        # the server committed it would start a duplicate workflow if sent again
+        retry = Retry(total=5, backoff_factor=0.3,
+                      status_forcelist=[429, 500, 502, 503, 504],
+                      allowed_methods=frozenset(["GET", "DELETE"]),
+                      respect_retry_after_header=True,
+                      raise_on_status=False)
+        # pool_block makes bursts wait for a pooled connection instead of opening
+        # extra short-lived sockets that are discarded afterwards
+        adapter = HTTPAdapter(pool_connections=4, pool_maxsize=POOL_MAXSIZE,
+                              max_retries=retry, pool_block=True)
+        self.sess.mount("http://", adapter)
+        self.sess.mount("https://", adapter)
+        # short-lived cache of GET results, keyed by API path
+        self._cache: Dict[str, Tuple[float, Any]] = {}
+        # single-flight: concurrent GETs of the same path share one request
+        self._inflight: Dict[str, _Flight] = {}
+        self._lock = threading.Lock()
+        # long-lived pool for concurrent per-item calls, shares the session's connections
+        self._pool = ThreadPoolExecutor(max_workers=FAN_OUT_WORKERS, thread_name_prefix="btrix")
         log.info("BrowsertrixClient initialized: base=%s", self.base)
         self._login()
 
@@ -28,8 +113,8 @@ class BrowsertrixClient:
         """
         path = f"{self.base}/api/orgs/{self.org_id}/collections?name={requests.utils.quote(self.collection)}"
         try:
-            resp = requests.get(path, headers=self.headers, timeout=15)
-            body = resp.json()
+            resp = self.sess.get(path, timeout=15)
+            body = _json(resp)
         except Exception as e:
             log.error("Failed to get collections: %s", str(e))
             return
@@ -45,11 +130,11 @@ class BrowsertrixClient:
         payload = {"username": self.auth[0], "password": self.auth[1]}
         headers = {"Content-Type": "application/x-www-form-urlencoded"}
         log.debug("Logging in to Browsertrix: %s", login_url)
-        resp = requests.post(login_url, data=payload, headers=headers, timeout=15)
+        resp = self.sess.post(login_url, data=payload, headers=headers, timeout=15)
         if not resp.ok:
             log.error("Login failed: %s %s", resp.status_code, resp.text)
             resp.raise_for_status()
-        data = resp.json()
+        data = _json(resp)
         token = data.get("access_token")
         if not token:
             raise RuntimeError("Login succeeded but no access token found in response")
@@ -60,16 +145,17 @@ class BrowsertrixClient:
         self.org_id = org_info.get("id") if org_info else None
         self.org_slug = org_info.get("slug") if org_info else None
         self.headers = {"Authorization": f"Bearer {self.token}", "Content-Type": "application/json"}
+        # installed once on the session, merged into every request by requests itself
+        self.sess.headers.update(self.headers)
         self._get_collection_id()
         log.info("org_id %s, org_slug %s, collection_id %s", self.org_id, self.org_slug, self.collection_id)
 
     def _request(self, method: str, path: str, retry: bool = True, **kwargs) -> requests.Response:
         """Make request to API, auto-login on 401 and retry once."""
         url = f"{self.base}{path}"
-        hdrs = kwargs.pop("headers", {})
-        # merge headers with auth headers (self.headers has precedence)
-        merged = {**hdrs, **self.headers}
-        resp = requests.request(method, url, headers=merged, timeout=30, **kwargs)
+        hdrs = kwargs.pop("headers", None)
+        # auth headers live on the session, only extra caller headers are passed here
+        resp = self.sess.request(method, url, headers=hdrs, timeout=30, **kwargs)
         if resp.status_code == 401 and retry:
             # try to re-authenticate and retry once
             log.debug("401 received, attempting re-login")
@@ -83,6 +169,52 @@ class BrowsertrixClient:
             raise
         return resp
 
+    def _cached_get(self, path: str, ttl: float = 3.0, fresh: bool = False) -> Any:
+        """GET path and return the decoded body, reusing results younger than ttl seconds.
+        Concurrent calls for the same path wait for the request already in flight."""
+        with self._lock:
+            now = time.monotonic()
+            if not fresh:
+                hit = self._cache.get(path)
+                if hit and now - hit[0] < ttl:
+                    return hit[1]
+            flight = self._inflight.get(path)
+            leader = flight is None
+            if leader:
+                flight = self._inflight[path] = _Flight()
+
+        if not leader:
+            flight.event.wait()
+            result = flight.result
+            if isinstance(result, Exception):
+                raise result
+            return result
+
+        try:
+            result = _json(self._request("get", path))
+        except Exception as e:
+            result = e
+        with self._lock:
+            if not isinstance(result, Exception):
+                if len(self._cache) > 1024:
+                    # drop expired entries so per-job paths don't accumulate
+                    self._cache = {k: v for k, v in self._cache.items() if now - v[0] < ttl}
+                self._cache[path] = (now, result)
+            # the result travels on the flight object, nothing is left behind per path
+            flight.result = result
+            del self._inflight[path]
+        flight.event.set()
+        if isinstance(result, Exception):
+            raise result
+        return result
+
+    def _fan_out(self, fn, items) -> List:
+        """Run independent per-item API calls concurrently over the pooled connections.
+        There is no bulk endpoint for crawlconfigs, so this is the batch path."""
+        if not self.token:
+            self._login()
+        return list(self._pool.map(fn, items))
+
     def create_job(self, url: str,  job_desc: str, job_setting: Dict) -> str:
         """Create and start a crawl job for the given URL.
         Crawl scope default to custom, with include regex to limit the crawl within the same prefix.
@@ -93,18 +225,17 @@ class BrowsertrixClient:
         TODO: for pages that requires login, we basically cannot crawl, not sure whether Browser Profile could work around it or not.
         """
         scope = "custom"
-        if re.search(r"https?://(www\.)?(facebook|twitter|discord|x|instagram|linkedin|pinterest|tiktok|youtube|play.google)(\.com)?", url):
+        if _PAGE_SCOPE_RE.search(url):
             scope = "page"
             log.debug("Special handling for social media site: %s", url)
 
         # if it is a page with params, set scope to "page"
-        if re.search(r"\?.+=.+", url):
+        if _URL_PARAMS_RE.search(url):
             scope = "page"
             log.debug("Setting scope to 'page' for URL with params: %s", url)
             include_regex = ""
         else:
-            scheme = "https" if url.startswith("https://") else "http"
-            include_regex = url.replace(".", r"\.").replace(scheme, r'^https?').replace(r'www\.', r'(www\.)?')
+            include_regex = _INCLUDE_TOKEN_RE.sub(lambda m: _INCLUDE_SUBS.get(m.group(0), r"^https?"), url)
             if not include_regex.endswith("/"):
                 include_regex += "(/|$)"
 
@@ -146,36 +277,11 @@ class BrowsertrixClient:
             self._login()
         path = f"/api/orgs/{self.org_id}/crawlconfigs/{job_name}/run"
         resp = self._request("post", path)
-        return resp.json()
+        return _json(resp)
 
     def _convert_status(self, state: str) -> str:
         """Convert Browsertrix crawl state to job status."""
-        mapping = {
-            "PAUSED": "STOPPED",
-            "PAUSED_STORAGE_QUOTA_REACHED": "STOPPED",
-            "PAUSED_TIME_QUOTA_REACHED": "STOPPED",
-            "PAUSED_ORG_READONLY": "STOPPED",
-            "STARTING": "RUNNING",
-            "WAITING_CAPACITY": "RUNNING",
-            "WAITING_ORG_LIMIT": "RUNNING",
-            "WAITING_DEDUPE_INDEX": "RUNNING",
-            "RUNNING": "RUNNING",
-            "PENDING-WAIT": "RUNNING",
-            "GENERATE-WACZ": "RUNNING",
-            "UPLOADING-WACZ": "RUNNING",
-            "CANCELED": "CANCELED",
-            "FAILED": "FAILED",
-            "FAILED_NOT_LOGGED_IN": "FAILED",
-            "SKIPPED_STORAGE_QUOTA_REACHED": "STOPPED",
-            "SKIPPED_TIME_QUOTA_REACHED": "STOPPED",
-            "COMPLETE": "FINISHED",
-            "STOPPED_BY_USER": "STOPPED",
-            "STOPPED_PAUSE_EXPIRED": "STOPPED",
-            "STOPPED_STORAGE_QUOTA_REACHED": "STOPPED",
-            "STOPPED_TIME_QUOTA_REACHED": "STOPPED",
-            "STOPPED_ORG_READONLY": "STOPPED"
-        }
-        return mapping.get(state.upper(), "UNKNOWN")
+        return _STATE_MAP.get(state.upper() if state else "", "UNKNOWN")
 
     def get_job_status(self, job_name: str) -> str:
         """
@@ -186,6 +292,40 @@ class BrowsertrixClient:
         if not job:
             log.error("Crawl job not found: %s", job_name)
             return {"status":"FAILED"}
+        return self._job_status(job)
+
+    def get_job_statuses(self, job_names: List[str]) -> Dict[str, Dict]:
+        """
+        Get the status of several jobs, keyed by job_name.
+        There is no bulk status endpoint; for more than a few jobs a single
+        (paginated) crawlconfig listing is cheaper than one request per job.
+        Jobs missing from the listing are looked up individually;
+        all jobs are left out of the result if the listing could not be fetched.
+        """
+        if len(job_names) < BULK_STATUS_MIN:
+            return dict(zip(job_names, self._fan_out(self.get_job_status, job_names)))
+
+        # a cached listing may predate jobs that were just created
+        configs = {c.get("id"): c for c in self.list_crawlconfigs(fresh=True)}
+        if not configs:
+            log.warning("No crawl configs listed, skip status update for %d jobs", len(job_names))
+            return {}
+        statuses = {}
+        missing = []
+        for name in job_names:
+            job = configs.get(name)
+            if job:
+                statuses[name] = self._job_status(job)
+            else:
+                missing.append(name)
+        # not being listed is no proof the job is gone, ask for those one by one
+        if missing:
+            log.debug("%d jobs not in crawl config listing, fetching individually", len(missing))
+            statuses.update(zip(missing, self._fan_out(self.get_job_status, missing)))
+        return statuses
+
+    def _job_status(self, job: Dict) -> Dict:
+        """Build job status from a crawlconfig."""
         state = job.get("lastCrawlState") if job.get("lastCrawlState") else "UNKNOWN"
         crawl_count = job.get("crawlSuccessfulCount", 0)
         crawl_pages = job.get("lastCrawlStats").get("done", 0) if job.get("lastCrawlStats") else 0
@@ -226,7 +366,7 @@ class BrowsertrixClient:
             self._login()
         path = f"/api/orgs/{self.org_id}/crawlconfigs/"
         resp = self._request("post", path, json=crawl_config)
-        return resp.json()
+        return _json(resp)
 
     def update_crawlconfig(self, cid: str, crawl_config: Dict) -> Dict:
         """
@@ -237,7 +377,13 @@ class BrowsertrixClient:
             self._login()
         path = f"/api/orgs/{self.org_id}/crawlconfigs/{cid}"
         resp = self._request("patch", path, json=crawl_config)
-        return resp.json()
+        return _json(resp)
+
+    def update_crawlconfigs(self, cids: List[str], crawl_config: Dict) -> List[Dict]:
+        """
+        Apply the same update to several crawl configs
+        """
+        return self._fan_out(lambda cid: self.update_crawlconfig(cid, crawl_config), cids)
 
     def del_crawlconfig(self, cid: str) -> Dict:
         """
@@ -248,9 +394,9 @@ class BrowsertrixClient:
             self._login()
         path = f"/api/orgs/{self.org_id}/crawlconfigs/{cid}"
         resp = self._request("delete", path)
-        return resp.json()
+        return _json(resp)
 
-    def list_crawlconfig(self, cid: str = ""):
+    def list_crawlconfig(self, cid: str = "", fresh: bool = False):
         """
         List a crawl config
         """
@@ -259,8 +405,7 @@ class BrowsertrixClient:
 
         path = f"/api/orgs/{self.org_id}/crawlconfigs/{cid}"
         try:
-            resp = self._request("get", path)
-            return resp.json()
+            return self._cached_get(path, fresh=fresh)
         except Exception as e:
             log.error("Failed to list crawl configs: %s", str(e))
             return None
@@ -274,13 +419,12 @@ class BrowsertrixClient:
 
         path = f"/api/orgs/{self.org_id}/crawls/{crawl_id}"
         try:
-            resp = self._request("get", path)
-            return resp.json()
+            return self._cached_get(path)
         except Exception as e:
             log.error("Failed to list crawl: %s", str(e))
             return None
 
-    def list_crawlconfigs(self) -> List[Dict]:
+    def list_crawlconfigs(self, fresh: bool = False) -> List[Dict]:
         """
         List crawl configs for an organization
         """
@@ -292,8 +436,7 @@ class BrowsertrixClient:
             page = 1
             while True:
                 path = f"/api/orgs/{self.org_id}/crawlconfigs?page={page}"
-                resp = self._request("get", path)
-                body = resp.json()
+                body = self._cached_get(path, fresh=fresh)
                 if not body.get("items"):
                     break
                 configs.extend(body["items"])
@@ -304,7 +447,7 @@ class BrowsertrixClient:
 
         return configs
 
-    def list_crawls(self) -> List[Dict]:
+    def list_crawls(self, fresh: bool = False) -> List[Dict]:
         """
         List crawls for an organization
         """
@@ -316,8 +459,7 @@ class BrowsertrixClient:
             page = 1
             while True:
                 path = f"/api/orgs/{self.org_id}/crawls?page={page}"
-                resp = self._request("get", path)
-                body = resp.json()
+                body = self._cached_get(path, fresh=fresh)
                 if not body.get("items"):
                     break
                 crawls.extend(body["items"])
@@ -332,7 +474,8 @@ class BrowsertrixClient:
         """
         Remove all crawls
         """
-        crawls = self.list_crawls()
+        # a cached listing could name crawls that were already deleted
+        crawls = self.list_crawls(fresh=True)
         crawl_ids = [c["id"] for c in crawls
                      if not only_failed or c.get("state","") == "failed"]
         if len(crawl_ids) > 0:
@@ -343,11 +486,10 @@ class BrowsertrixClient:
         """
         Remove all crawlconfigs, only for test
         """
-        configs = self.list_crawlconfigs()
-        for config in configs:
-            if only_failed and config.get("lastCrawlState","") != "failed":
-                continue
-            self.del_crawlconfig(config["id"])
+        configs = self.list_crawlconfigs(fresh=True)
+        cids = [c["id"] for c in configs
+                if not only_failed or c.get("lastCrawlState","") == "failed"]
+        self._fan_out(self.del_crawlconfig, cids)
 
     def add_crawl_to_collection(self, crawl_ids: List[str]) -> Dict:
         """
@@ -357,4 +499,4 @@ class BrowsertrixClient:
             self._login()
         path = f"/api/orgs/{self.org_id}/collections/{self.collection_id}/add"
         resp = self._request("post", path, json={"crawlIds": crawl_ids})
-        return resp.json()
+        return _json(resp)
@@ -1,16 +1,28 @@
 from __future__ import annotations
+import os
+import functools
 import yaml
 from dataclasses import dataclass
 from typing import Any, Dict
 
+try:
+    from yaml import CSafeLoader as _Loader
+except ImportError:
+    _Loader = yaml.SafeLoader
+
+@functools.lru_cache(maxsize=8)
+def _load_cached(path: str, mtime_ns: int) -> Dict[str, Any]:
+    # mtime_ns is part of the cache key so edits to the file are picked up
+    with open(path, "r", encoding="utf-8") as f:
+        return yaml.load(f, Loader=_Loader)
+
 @dataclass
 class Config:
     data: Dict[str, Any]
 
     @classmethod
     def load(cls, path: str) -> "Config":
-        with open(path, "r", encoding="utf-8") as f:
-            data = yaml.safe_load(f)
+        data = _load_cached(path, os.stat(path).st_mtime_ns)
         return cls(data=data)
 
     def __getitem__(self, item):
@@ -1,8 +1,10 @@
 # fma/jobqueue.py
 from __future__ import annotations
+import re
 import threading
 import time
 from typing import Dict, List
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 from .state import State
 from .btrix_cli import BrowsertrixClient
@@ -15,6 +17,22 @@ log = logging.getLogger(__name__)
 LIVE_CRAWL = "LIVE_CRAWL"
 WAYBACK_DOWNLOAD = "WAYBACK_DOWNLOAD"
 
+# max number of dequeued jobs started concurrently
+DISPATCH_WORKERS = 16
+
+# min seconds between WAL truncations from the worker loop
+CHECKPOINT_INTERVAL = 300
+
+# job description stored with Browsertrix workflows and wayback downloads
+_DESC_RE = re.compile(r"nca_id:(\d+),validation_date:([^,]*)")
+
+def _parse_desc(desc: str):
+    """ Parse 'nca_id:<id>,validation_date:<date>' job description into (nca_id, validation_date)."""
+    m = _DESC_RE.match(desc) if desc else None
+    if not m:
+        return 0, ""
+    return int(m.group(1)), m.group(2)
+
 class JobQueueWorker:
     """ Manages job queue for crawl and download jobs. """
     def __init__(self, cfg, state: State):
@@ -31,11 +49,22 @@ class JobQueueWorker:
             output_base=cfg["wb_downloader"]["output_dir"],
             concurrency=int(cfg["wb_downloader"]["concurrency"])
         )
+        self._dispatch_pool = ThreadPoolExecutor(max_workers=DISPATCH_WORKERS,
+                                                 thread_name_prefix="jobqueue-dispatch")
         self._stop = threading.Event()
+        # set by producers (or stop) to wake the loop before reconcile_every elapses
+        self._wake = threading.Event()
+        # start with a reconcile/dequeue pass instead of waiting a full interval
+        self._wake.set()
 
     def stop(self):
         """Signal the worker to stop."""
         self._stop.set()
+        self._wake.set()
+
+    def notify(self):
+        """Wake the worker, e.g. after new jobs were enqueued."""
+        self._wake.set()
 
     def _handle_job(self, job) -> None:
         jtype = job["type"]
@@ -64,6 +93,12 @@ class JobQueueWorker:
 
         self.state.update_job_info(job["id"], job_name, job_link)
 
+    def _handle_job_safe(self, job) -> None:
+        try:
+            self._handle_job(job)
+        except Exception as ex:
+            log.exception("Job %s failed in handler, error: %s", job["id"], str(ex))
+
     def _get_job_status(self, job_type, job_name) -> str:
         """ job status: PENDING->RUNNING->FINISHED/FAILED."""
         if job_type == LIVE_CRAWL:
@@ -73,14 +108,33 @@ class JobQueueWorker:
         else:
             return {"Status": "UNKNOWN"}
 
+    def _get_job_statuses(self, jobs: List[Dict]) -> Dict[int, Dict]:
+        """ Get statuses of jobs keyed by job id, with one batched Browsertrix query."""
+        live_names = [j.get("job_name") for j in jobs if j.get("type") == LIVE_CRAWL]
+        live = self.btrix.get_job_statuses(live_names) if live_names else {}
+        statuses = {}
+        for job in jobs:
+            if job.get("type") == LIVE_CRAWL:
+                status = live.get(job.get("job_name"))
+            else:
+                status = self._get_job_status(job.get("type"), job.get("job_name"))
+            if status is not None:
+                statuses[job["id"]] = status
+        return statuses
+
     def _reconcile(self):
         """Poll Browsertrix for RUNNING jobs and mark SUCCEEDED when all underlying
         job_names are no longer RUNNING."""
         running = self.state.list_running_jobs()
+        if not running:
+            return
+        statuses = self._get_job_statuses(running)
         for job in running:
             job_name = job.get("job_name")
             jtype = job.get("type")
-            status = self._get_job_status(jtype, job_name)
+            status = statuses.get(job["id"])
+            if status is None:
+                continue
             if status["status"] == 'FINISHED':
                 self.state.mark_finished(job["id"], status["crawl_count"], status["file_count"])
             elif status["status"] == 'FAILED':
@@ -96,39 +150,39 @@ class JobQueueWorker:
 
     def rebuild_job_info(self) -> List[Dict]:
         """ Rebuild job info from existing jobs in Browsertrix and WBDownloader."""
+        base_url = self.cfg['browsertrix']['base_url'].rstrip('/')
+        crawl_rows = []
         for job in self.btrix.rebuild_job_info():
-            desc = job["desc"]
-            nca_id = int(desc.split(",")[0].split(":")[1]) if desc else 0
-            validation_date = desc.split(",")[1].split(":")[1] if desc else ""
+            nca_id, validation_date = _parse_desc(job["desc"])
             job_name=job["job_name"]
-            job_link = f"{self.cfg['browsertrix']['base_url'].rstrip('/')}/orgs/{self.btrix.org_slug}/workflows/{job_name}"
-            self.state.add_history_job(
-                job_type=LIVE_CRAWL,
-                job_name=job_name,
-                url=job["url"],
-                nca_id=nca_id,
-                validation_date=validation_date,
-                status=job["status"],
-                crawl_count=job["crawl_count"],
-                file_count=job["file_count"],
-                link=job_link
-            )
-
+            crawl_rows.append({
+                "job_type": LIVE_CRAWL,
+                "job_name": job_name,
+                "url": job["url"],
+                "nca_id": nca_id,
+                "validation_date": validation_date,
+                "status": job["status"],
+                "crawl_count": job["crawl_count"],
+                "file_count": job["file_count"],
+                "link": f"{base_url}/orgs/{self.btrix.org_slug}/workflows/{job_name}"
+            })
+        self.state.add_history_jobs(crawl_rows)
+
+        download_rows = []
         for job in self.wb_downloader.rebuild_job_info():
-            desc = job["desc"]
-            nca_id = int(desc.split(",")[0].split(":")[1]) if desc else 0
-            validation_date = desc.split(",")[1].split(":")[1] if desc else ""
-            self.state.add_history_job(
-                job_type=WAYBACK_DOWNLOAD,
-                job_name=job["job_name"],
-                url=job["url"],
-                nca_id=nca_id,
-                validation_date=validation_date,
-                status=job["status"],
-                crawl_count=1,
-                file_count=job["file_count"],
-                link=""
-            )
+            nca_id, validation_date = _parse_desc(job["desc"])
+            download_rows.append({
+                "job_type": WAYBACK_DOWNLOAD,
+                "job_name": job["job_name"],
+                "url": job["url"],
+                "nca_id": nca_id,
+                "validation_date": validation_date,
+                "status": job["status"],
+                "crawl_count": 1,
+                "file_count": job["file_count"],
+                "link": ""
+            })
+        self.state.add_history_jobs(download_rows)
 
     def run_forever(self):
         """Main loop to process job queue."""
@@ -140,13 +194,21 @@ class JobQueueWorker:
         log.info("JobQueue worker started: max_parallel_crawl_jobs=%d, max_parallel_download_jobs=%d, reconcile_every=%ds",
                  max_parallel[LIVE_CRAWL], max_parallel[WAYBACK_DOWNLOAD], reconcile_every)
 
+        last_checkpoint = time.monotonic()
         while not self._stop.is_set():
-            time.sleep(reconcile_every)
+            self._wake.wait(timeout=reconcile_every)
+            self._wake.clear()
+            if self._stop.is_set():
+                break
             try:
                 self._reconcile()
             except Exception:
                 log.exception("Reconcile failed")
 
+            if time.monotonic() - last_checkpoint >= CHECKPOINT_INTERVAL:
+                self.state.checkpoint()
+                last_checkpoint = time.monotonic()
+
             jobs = []
             for job_type in [LIVE_CRAWL, WAYBACK_DOWNLOAD]:
                 running = self.state.count_running_jobs(job_type)
@@ -161,14 +223,13 @@ class JobQueueWorker:
             if len(jobs) == 0:
                 continue
 
+            self.state.mark_running_bulk([job["id"] for job in jobs])
             for job in jobs:
-                self.state.mark_running(job["id"])
                 log.info("Dequeued -> RUNNING id=%s type=%s url=%s",
                          job["id"], job["type"], job["url"])
-                try:
-                    self._handle_job(job)
-                except Exception as ex:
-                    log.exception("Job %s failed in handler, error: %s", job["id"], str(ex))
+            # job creation is one remote call per job and they don't depend on each other
+            list(self._dispatch_pool.map(self._handle_job_safe, jobs))
 
+        self._dispatch_pool.shutdown(wait=True)
         self.wb_downloader.destroy()
         log.info("JobQueue worker stopped")
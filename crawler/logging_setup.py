@@ -1,6 +1,10 @@
 from __future__ import annotations
 import logging, logging.config, os, json
 from pathlib import Path
+try:
+    import orjson
+except ImportError:
+    orjson = None
 
 def _ensure_parent(path: str) -> None:
     try:
@@ -8,6 +12,26 @@ def _ensure_parent(path: str) -> None:
     except Exception:
         pass
 
+# built once, reused for every record
+if orjson is not None:
+    def _dumps(data: dict) -> str:
+        return orjson.dumps(data, default=str).decode()
+else:
+    _dumps = json.JSONEncoder(ensure_ascii=False, separators=(",", ":"), default=str).encode
+
+class JsonFormatter(logging.Formatter):
+    """Lightweight JSON formatter, one compact object per line."""
+    def format(self, record: logging.LogRecord) -> str:
+        data = {
+            "time": self.formatTime(record, "%Y-%m-%dT%H:%M:%S%z"),
+            "level": record.levelname,
+            "logger": record.name,
+            "msg": record.getMessage(),
+        }
+        if record.exc_info:
+            data["exc_info"] = self.formatException(record.exc_info)
+        return _dumps(data)
+
 def build_dict_config(cfg: dict) -> dict:
     level = (cfg.get("level") or "INFO").upper()
     log_file = cfg.get("file") or "logs/app.log"
@@ -21,21 +45,8 @@ def build_dict_config(cfg: dict) -> dict:
 
     # Formatters
     if as_json:
-        # Lightweight JSON formatter
-        class JsonFormatter(logging.Formatter):
-            def format(self, record: logging.LogRecord) -> str:
-                data = {
-                    "time": self.formatTime(record, "%Y-%m-%dT%H:%M:%S%z"),
-                    "level": record.levelname,
-                    "logger": record.name,
-                    "msg": record.getMessage(),
-                }
-                if record.exc_info:
-                    data["exc_info"] = self.formatException(record.exc_info)
-                return json.dumps(data, ensure_ascii=False)
-        json_fmt_path = "crawler.logging_setup.JsonFormatter"
         fmt_name = "json"
-        fmt_config = {"()": json_fmt_path}
+        fmt_config = {"()": JsonFormatter}
     else:
         fmt_name = "standard"
         fmt_config = {"format": "%(asctime)s %(levelname)s [%(name)s] %(message)s"}
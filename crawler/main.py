@@ -26,12 +26,14 @@ def main():
 
     # Run the scheduler loop (blocks)
     try:
-        run_loop(cfg, st)
+        run_loop(cfg, st, worker.notify)
     except Exception as e:
         log.info('Exception %s occured', str(e))
     finally:
         log.info('Quiting the crawler...')
         worker.stop()
+        # the worker wakes on stop(); wait for it so the downloader gets cleaned up
+        t.join(timeout=60)
 
 if __name__ == "__main__":
     main()
@@ -1,13 +1,13 @@
 from __future__ import annotations
 from datetime import datetime, date, time as dtime, timedelta, timezone
-import time
-from typing import Dict, List, Tuple, Set, Optional
+import threading
+from typing import Callable, Dict, List, Tuple, Set, Optional
 from pathlib import Path
 from .config import Config
 from .state import State
 from .jobqueue import LIVE_CRAWL, WAYBACK_DOWNLOAD
 import traceback
-import pandas as pd
+import csv
 
 import logging
 log = logging.getLogger(__name__)
@@ -25,18 +25,36 @@ def get_iosco_urls(
     if not output_today.exists():
         log.warning(f'folder for today: {str(output_today)} doest not exist!')
         return {}
-    url_df = pd.read_csv(output_today / 'clean_urls.csv')
-    url_df["validation_date"] = pd.to_datetime(url_df["validation_date"],
-                                               format="%Y-%m-%d",
-                                               errors="coerce").dt.date
-    if start_date and end_date:
-        url_df = url_df.query('validation_date >= @start_date and validation_date <= @end_date')
-    if nca_id:
-        url_df = url_df.query('nca_id == @nca_id')
-    return url_df.set_index('url').to_dict('index')
+    urls = {}
+    with open(output_today / 'clean_urls.csv', 'r', newline='', encoding='utf-8') as f:
+        reader = csv.reader(f)
+        header = next(reader, None)
+        if not header:
+            return {}
+        idx = {name: i for i, name in enumerate(header)}
+        url_i, date_i, nca_i = idx["url"], idx["validation_date"], idx["nca_id"]
+        cols = [(name, i) for name, i in idx.items() if name not in ("url", "validation_date")]
+        for row in reader:
+            if not row:
+                continue
+            if len(row) < len(header):
+                row += [""] * (len(header) - len(row))
+            try:
+                validation_date = datetime.strptime(row[date_i], "%Y-%m-%d").date()
+            except ValueError:
+                continue
+            if start_date and end_date and not start_date <= validation_date <= end_date:
+                continue
+            if nca_id and row[nca_i] != str(nca_id):
+                continue
+            info = {name: row[i] for name, i in cols}
+            info["validation_date"] = validation_date
+            urls[row[url_i]] = info
+    return urls
 
-def run_once(cfg: Config, st: State):
-    """Run one ingestion cycle: fetch URLs, enqueue jobs."""
+def run_once(cfg: Config, st: State, notify: Optional[Callable[[], None]] = None):
+    """Run one ingestion cycle: fetch URLs, enqueue jobs.
+    notify is called once jobs have been enqueued, to wake the job queue worker."""
     now = datetime.now(timezone.utc)
     log.info("Daily run started at %s", now.isoformat())
 
@@ -78,13 +96,15 @@ def run_once(cfg: Config, st: State):
         )
         st.set_last_incremental_run(now)
 
-    url_info_filtered = {k:v for k,v in url_info.items() if not st.check_url_exists(k)}
+    url_info_filtered = {k:url_info[k] for k in st.filter_new_urls(list(url_info))}
     total_urls = len(url_info_filtered)
     live_urls = sum(1 for v in url_info_filtered.values() if str(v.get("liveness", "")).lower() == "live")
     dead_urls = sum(1 for v in url_info_filtered.values() if str(v.get("liveness", "")).lower() == "dead")
     log.info(f"Total URLs to process: {total_urls}, live: {live_urls}, dead: {dead_urls}")
 
     # 2) create crawling job or wayback download job
+    job_rows = []
+    ncas = {}
     for k, v in url_info_filtered.items():
         job_type = LIVE_CRAWL
         job_desc = 'Live'
@@ -101,34 +121,38 @@ def run_once(cfg: Config, st: State):
             job_priority = 100
 
         nca_id = int(nca_id)
-        st.add_nca(nca_id, nca_jurisdiction, nca_name)
-        st.enqueue_job_unique(job_type, k, nca_id, validate_date, job_priority)
-        log.info("Enqueued %s job for %s", job_desc, k)
+        ncas.setdefault(nca_id, (nca_id, nca_jurisdiction, nca_name))
+        job_rows.append((job_type, k, nca_id, validate_date, job_priority))
+        log.info("Enqueue %s job for %s", job_desc, k)
+    st.add_ncas(list(ncas.values()))
+    st.enqueue_jobs_bulk(job_rows)
 
-def _next_daily_time(local_hhmm: str) -> float:
-    # returns seconds until next occurrence of local_hhmm
+    if url_info_filtered and notify:
+        notify()
+
+def _next_daily_time(local_hhmm: str) -> datetime:
+    # returns the next occurrence of local_hhmm, strictly after now
     hh, mm = map(int, local_hhmm.split(":"))
     now = datetime.now()
     target = datetime.combine(now.date(), dtime(hh, mm))
     if target <= now:
         target += timedelta(days=1)
-    return (target - now).total_seconds()
+    return target
 
-def run_loop(cfg: Config, st: State):
-    """Run the daily ingestion loop."""
-    while True:
+def run_loop(cfg: Config, st: State, notify: Optional[Callable[[], None]] = None,
+             stop: Optional[threading.Event] = None):
+    """Run the daily ingestion loop until stop is set."""
+    stop = stop or threading.Event()
+    next_run = _next_daily_time(cfg["schedule"]["daily_run_time"])
+    # a single wait until the next run; the loop only wakes for runs or stop
+    while not stop.wait(timeout=max(0.0, (next_run - datetime.now()).total_seconds())):
+        # Event.wait runs on the monotonic clock, don't run early if wall clock lags behind it
+        if datetime.now() < next_run:
+            continue
         try:
-            # Wait until next daily time
-            wait_s = _next_daily_time(cfg["schedule"]["daily_run_time"])
-            time.sleep(wait_s)
-
             # Daily ingestion -> enqueue jobs
-            run_once(cfg, st)
-
-            # Sleep a short period before recalculating
-            time.sleep(600)
+            run_once(cfg, st, notify)
         except Exception as e:
             log.error('An exception occurred: %s', str(e))
             traceback.print_exc()
-            time.sleep(5)
-
+        next_run = _next_daily_time(cfg["schedule"]["daily_run_time"])
@@ -1,14 +1,29 @@
 from __future__ import annotations
 import json
+import sys
 import sqlite3
 from pathlib import Path
-from typing import Optional, Tuple, List, Dict
+from typing import Any, Callable, Optional, Tuple, List, Dict
+from collections import OrderedDict
 from datetime import datetime, timezone
 import threading
+import queue
+from contextlib import contextmanager
 import logging
 
 log = logging.getLogger(__name__)
 
+# UPDATE ... RETURNING needs SQLite 3.35
+_HAS_RETURNING = sqlite3.sqlite_version_info >= (3, 35, 0)
+
+# current UTC time in the isoformat() layout, evaluated by SQLite per statement
+_NOW = "strftime('%Y-%m-%dT%H:%M:%f+00:00','now')"
+
+# max idle read-only connections kept for dashboard queries
+RO_POOL_SIZE = 8
+# max dashboard query results kept, valid until the database is written to
+READ_CACHE_SIZE = 256
+
 SCHEMA = """
 PRAGMA journal_mode=WAL;
 
@@ -40,8 +55,20 @@ CREATE TABLE IF NOT EXISTS ncas (
   nca_name TEXT NOT NULL
 );
 
-CREATE INDEX IF NOT EXISTS idx_jobs_status ON jobs(status, priority, created_at);
+-- running/status lookups filter on status + type, the dashboard sorts by created_at;
+-- the PENDING queue order is served by idx_jobs_pending
+DROP INDEX IF EXISTS idx_jobs_status;
+CREATE INDEX IF NOT EXISTS idx_jobs_status_type ON jobs(status, type, created_at);
 CREATE INDEX IF NOT EXISTS idx_jobs_url ON jobs(url);
+-- dashboard listing, newest first
+CREATE INDEX IF NOT EXISTS idx_jobs_created_at ON jobs(created_at);
+-- queue order of PENDING jobs per type, only holds the pending rows
+CREATE INDEX IF NOT EXISTS idx_jobs_pending ON jobs(type, priority, created_at) WHERE status='PENDING';
+-- dashboard filters: type alone, validation date range, and jurisdiction via ncas -> jobs.nca_id
+CREATE INDEX IF NOT EXISTS idx_jobs_type_created ON jobs(type, created_at);
+CREATE INDEX IF NOT EXISTS idx_jobs_validation_date ON jobs(validation_date);
+CREATE INDEX IF NOT EXISTS idx_jobs_nca_created ON jobs(nca_id, created_at);
+CREATE INDEX IF NOT EXISTS idx_ncas_jurisdiction ON ncas(nca_jurisdiction);
 """
 
 class State:
@@ -50,6 +77,16 @@ class State:
         self.db_path = db_path
         Path(db_path).parent.mkdir(parents=True, exist_ok=True)
         self._local = threading.local()
+        self._lock = threading.Lock()
+        self._schema_ready = False
+        # every thread's connection with its owner, so connections of exited threads can be closed
+        self._conns: Dict[int, Tuple[threading.Thread, sqlite3.Connection]] = {}
+        # read-only connections shared by short-lived reader threads (web requests)
+        self._ro_pool: queue.LifoQueue = queue.LifoQueue(maxsize=RO_POOL_SIZE)
+        # dashboard query results keyed by query args, tagged with the data_version they were read at
+        self._read_cache: "OrderedDict[tuple, Tuple[int, Any]]" = OrderedDict()
+        self._read_cache_lock = threading.Lock()
+        self._version_conn: Optional[sqlite3.Connection] = None
         # Ensure schema exists in the creating thread
         self._conn()
         log.info("SQLite state initialized at %s", self.db_path)
@@ -63,32 +100,137 @@ class State:
                 isolation_level=None,        # autocommit mode
                 check_same_thread=False,     # allow use in this thread (distinct conn per thread)
                 detect_types=sqlite3.PARSE_DECLTYPES,
+                cached_statements=256,       # keep the prepared statements of all queries below
+                timeout=5.0,                 # busy timeout: wait for a concurrent writer instead of SQLITE_BUSY
             )
             # Pragmas for concurrency/consistency
+            # rows convert straight to dicts keyed by column name, and still index by position
+            conn.row_factory = sqlite3.Row
             conn.execute("PRAGMA foreign_keys = ON;")
             conn.execute("PRAGMA journal_mode=WAL;")
             conn.execute("PRAGMA synchronous = NORMAL;")
-            self._init_db(conn)
+            # checkpoint every ~16MB of WAL instead of the default 4MB, fewer checkpoint stalls on commit
+            conn.execute("PRAGMA wal_autocheckpoint = 4000;")
+            # read pages through mmap; page cache is per connection (one per thread), so keep it moderate
+            if sys.maxsize > 2**32:
+                # a 256MB mapping would eat too much of a 32-bit address space
+                conn.execute("PRAGMA mmap_size = 268435456;")
+            conn.execute("PRAGMA cache_size = -16384;")
+            conn.execute("PRAGMA temp_store = MEMORY;")
+            # schema only needs to be created once, not for every thread's connection
+            with self._lock:
+                if not self._schema_ready:
+                    self._init_db(conn)
+                    self._schema_ready = True
+                self._close_dead_conns()
+                self._conns[threading.get_ident()] = (threading.current_thread(), conn)
             self._local.conn = conn
         return conn
 
+    @contextmanager
+    def _ro_conn(self):
+        """Borrow a pooled read-only connection, for reads that don't need this thread's
+        read-write connection (a new one per web request thread would be opened otherwise)."""
+        try:
+            conn = self._ro_pool.get_nowait()
+        except queue.Empty:
+            conn = sqlite3.connect(
+                Path(self.db_path).resolve().as_uri() + "?mode=ro",
+                uri=True,
+                check_same_thread=False,     # pooled, used by one thread at a time
+                detect_types=sqlite3.PARSE_DECLTYPES,
+                cached_statements=256,
+                timeout=5.0,
+            )
+            conn.row_factory = sqlite3.Row
+            conn.execute("PRAGMA query_only = ON;")
+            if sys.maxsize > 2**32:
+                conn.execute("PRAGMA mmap_size = 268435456;")
+            conn.execute("PRAGMA cache_size = -16384;")
+        try:
+            yield conn
+        finally:
+            try:
+                self._ro_pool.put_nowait(conn)
+            except queue.Full:
+                conn.close()
+
+    def _data_version(self) -> int:
+        """Changes whenever any other connection (in this or another process) commits.
+        Caller must hold self._read_cache_lock."""
+        if self._version_conn is None:
+            self._version_conn = sqlite3.connect(
+                Path(self.db_path).resolve().as_uri() + "?mode=ro", uri=True, check_same_thread=False)
+        return self._version_conn.execute("PRAGMA data_version").fetchone()[0]
+
+    def _cached_read(self, key: tuple, read: Callable[[], Any]) -> Any:
+        """Return the cached result of read() for key unless the database was written since."""
+        with self._read_cache_lock:
+            version = self._data_version()
+            hit = self._read_cache.get(key)
+            if hit is not None and hit[0] == version:
+                self._read_cache.move_to_end(key)
+                return hit[1]
+        result = read()
+        with self._read_cache_lock:
+            self._read_cache[key] = (version, result)
+            self._read_cache.move_to_end(key)
+            while len(self._read_cache) > READ_CACHE_SIZE:
+                self._read_cache.popitem(last=False)
+        return result
+
     @property
     def conn(self) -> sqlite3.Connection:
         """Compatibility: expose the current thread's connection."""
         return self._conn()
 
+    def _close_dead_conns(self):
+        """Close connections left by exited threads, they are not closed when the thread ends.
+        Caller must hold self._lock."""
+        for ident, (thread, conn) in list(self._conns.items()):
+            if not thread.is_alive():
+                del self._conns[ident]
+                try:
+                    conn.close()
+                except sqlite3.Error:
+                    log.debug("Failed to close connection of exited thread %s", thread.name)
+
+    def checkpoint(self) -> bool:
+        """Checkpoint the WAL and truncate it, to bound its size between autocheckpoints.
+        Returns False if the checkpoint could not complete."""
+        try:
+            row = self.conn.execute("PRAGMA wal_checkpoint(TRUNCATE);").fetchone()
+        except sqlite3.OperationalError as e:
+            log.debug("WAL checkpoint skipped: %s", e)
+            return False
+        if row and row[0]:
+            log.debug("WAL checkpoint blocked by readers or writers")
+            return False
+        return True
+
     def close(self):
         """Close the current thread's connection, if any."""
         conn = getattr(self._local, "conn", None)
         if conn is not None:
+            try:
+                # let SQLite refresh planner statistics that went stale during this session
+                conn.execute("PRAGMA optimize;")
+            except sqlite3.Error as e:
+                log.debug("PRAGMA optimize failed: %s", e)
             try:
                 conn.close()
             finally:
                 self._local.conn = None
+                with self._lock:
+                    self._conns.pop(threading.get_ident(), None)
 
     def _init_db(self, conn: sqlite3.Connection):
         cur = conn.cursor()
         cur.executescript(SCHEMA)
+        # give the planner statistics once; afterwards PRAGMA optimize in close() keeps them
+        # current, a full ANALYZE on every open would take the write lock and scan all indexes
+        if not cur.execute("SELECT 1 FROM sqlite_master WHERE name='sqlite_stat1'").fetchone():
+            cur.execute("ANALYZE")
 
     # --- meta helpers ---
     def get_meta(self, key: str) -> Optional[str]:
@@ -138,37 +280,84 @@ class State:
                         file_count: int,
                         link: str="") -> int:
         """Add a history job record."""
-        now = datetime.now(timezone.utc).isoformat()
         cur = self.conn.cursor()
         cur.execute(
-            """INSERT INTO jobs(job_name,type,url,nca_id,validation_date,link,status,crawl_count,last_crawl_file_count,created_at,updated_at)
-               VALUES(?,?,?,?,?,?,?,?,?,?,?)""",
-            (job_name, job_type, url, nca_id, validation_date, link, status, crawl_count, file_count, now, now)
+            f"""INSERT INTO jobs(job_name,type,url,nca_id,validation_date,link,status,crawl_count,last_crawl_file_count,created_at,updated_at)
+               VALUES(?,?,?,?,?,?,?,?,?,{_NOW},{_NOW})""",
+            (job_name, job_type, url, nca_id, validation_date, link, status, crawl_count, file_count)
         )
         return cur.lastrowid
 
+    def add_history_jobs(self, rows: List[Dict]) -> int:
+        """Add history job records in a single transaction.
+        Each row carries the keyword arguments of add_history_job."""
+        if not rows:
+            return 0
+        params = [(r["job_name"], r["job_type"], r["url"], r["nca_id"], r["validation_date"],
+                   r.get("link", ""), r["status"], r["crawl_count"], r["file_count"])
+                  for r in rows]
+        conn = self.conn
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            conn.executemany(
+                f"""INSERT INTO jobs(job_name,type,url,nca_id,validation_date,link,status,crawl_count,last_crawl_file_count,created_at,updated_at)
+                   VALUES(?,?,?,?,?,?,?,?,?,{_NOW},{_NOW})""",
+                params
+            )
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+        return len(params)
+
     def enqueue_job_unique(self, job_type: str, url: str, nca_id: int, validation_date: str, priority: int = 100) -> int | None:
         """
         Insert a PENDING job if there is no job of the same url + type
         Return job id or None if skipped.
         """
         cur = self.conn.cursor()
-        row = cur.execute(
-            "SELECT id FROM jobs WHERE type=? AND url=? AND status='PENDING' LIMIT 1",
-            (job_type, url)
-        ).fetchone()
-        if row:
-            log.debug("Skip enqueue: existing PENDING type=%s url=%s", job_type, url)
-            return None
-        now = datetime.now(timezone.utc).isoformat()
+        # unary + keeps the duplicate check on idx_jobs_url, url is near-unique while status/type are not
         cur.execute(
-            """INSERT INTO jobs(type,url,nca_id,validation_date,status,priority,created_at,updated_at)
-               VALUES(?,?,?,?,?,?,?,?)""",
-            (job_type, url, nca_id, validation_date, "PENDING", priority, now, now)
+            f"""INSERT INTO jobs(type,url,nca_id,validation_date,status,priority,created_at,updated_at)
+               SELECT ?,?,?,?,'PENDING',?,{_NOW},{_NOW}
+               WHERE NOT EXISTS (SELECT 1 FROM jobs WHERE +type=? AND url=? AND +status='PENDING')""",
+            (job_type, url, nca_id, validation_date, priority, job_type, url)
         )
+        if cur.rowcount == 0:
+            log.debug("Skip enqueue: existing PENDING type=%s url=%s", job_type, url)
+            return None
         log.info("Enqueued job type=%s url=%s priority=%s", job_type, url, priority)
         return cur.lastrowid
 
+    def enqueue_jobs_bulk(self, rows: List[Tuple[str, str, int, str, int]]) -> int:
+        """
+        Insert PENDING jobs from (job_type, url, nca_id, validation_date, priority) rows
+        in one transaction, skipping those with a PENDING job of the same url + type.
+        Return the number of jobs enqueued.
+        """
+        if not rows:
+            return 0
+        conn = self.conn
+        before = conn.total_changes
+        # take the write lock up front: the duplicate check and the inserts see the same snapshot,
+        # and a concurrent writer can't make the read->write upgrade fail with SQLITE_BUSY
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            # duplicate check probes idx_jobs_url, see enqueue_job_unique
+            conn.executemany(
+                f"""INSERT INTO jobs(type,url,nca_id,validation_date,status,priority,created_at,updated_at)
+                   SELECT ?,?,?,?,'PENDING',?,{_NOW},{_NOW}
+                   WHERE NOT EXISTS (SELECT 1 FROM jobs WHERE +type=? AND url=? AND +status='PENDING')""",
+                ((t, u, n, d, p, t, u) for t, u, n, d, p in rows)
+            )
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+        count = conn.total_changes - before
+        log.info("Enqueued %d of %d jobs", count, len(rows))
+        return count
+
     def fetch_next_pending(self, job_type: str, limit: int) -> list[dict]:
         """ Fetch next PENDING jobs up to limit, ordered by priority and created_at."""
         rows = self.conn.execute(
@@ -177,61 +366,63 @@ class State:
                ORDER BY priority ASC, created_at ASC
                LIMIT ?""", (job_type, limit)
         ).fetchall()
-        out = []
-        for r in rows:
-            out.append({
-                "id": r[0], "job_name": r[1], "type": r[2], "url": r[3], "nca_id": r[4], "validation_date": r[5]
-            })
-        return out
+        return [dict(r) for r in rows]
 
     def mark_running(self, job_id: int):
         """Mark a job as RUNNING."""
-        now = datetime.now(timezone.utc).isoformat()
         self.conn.execute(
-            "UPDATE jobs SET status='RUNNING', updated_at=? WHERE id=?",
-            (now, job_id)
+            f"UPDATE jobs SET status='RUNNING', updated_at={_NOW} WHERE id=?",
+            (job_id,)
+        )
+
+    def mark_running_bulk(self, job_ids: List[int]):
+        """Mark several jobs as RUNNING in one statement."""
+        if not job_ids:
+            return
+        self.conn.execute(
+            f"UPDATE jobs SET status='RUNNING', updated_at={_NOW} WHERE id IN ({','.join('?' * len(job_ids))})",
+            job_ids
         )
 
     def mark_finished(self, job_id: int, crawl_count: int, file_count: int):
         """Mark a job as FINISHED."""
-        now = datetime.now(timezone.utc).isoformat()
         self.conn.execute(
-            "UPDATE jobs SET status='FINISHED',crawl_count=?,last_crawl_file_count=?,updated_at=? WHERE id=?",
-            (crawl_count, file_count, now, job_id)
+            f"UPDATE jobs SET status='FINISHED',crawl_count=?,last_crawl_file_count=?,updated_at={_NOW} WHERE id=?",
+            (crawl_count, file_count, job_id)
         )
 
     def mark_failed(self, job_id: int, max_retries: int=0):
         """Mark a job as FAILED or re-PENDING for retry."""
-        cur = self.conn.cursor()
-        now = datetime.now(timezone.utc).isoformat()
-        row = cur.execute("SELECT attempts FROM jobs WHERE id=?", (job_id,)).fetchone()
-        attempts = (row[0] if row else 0) + 1
-        if attempts >= max_retries:
-            self.conn.execute(
-                "UPDATE jobs SET status='FAILED', attempts=?, updated_at=? WHERE id=?",
-                (attempts, now, job_id)
-            )
+        # attempts is bumped and checked in the same statement, no read-modify-write race
+        sql = f"""UPDATE jobs SET attempts=attempts+1,
+                   status=CASE WHEN attempts+1 >= ? THEN 'FAILED' ELSE 'PENDING' END,
+                   updated_at={_NOW}
+                 WHERE id=?"""
+        if _HAS_RETURNING:
+            row = self.conn.execute(sql + " RETURNING status", (max_retries, job_id)).fetchone()
         else:
-            # Put back to PENDING for retry
-            self.conn.execute(
-                "UPDATE jobs SET status='PENDING', attempts=?, updated_at=? WHERE id=?",
-                (attempts, now, job_id)
-            )
+            conn = self.conn
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                conn.execute(sql, (max_retries, job_id))
+                row = conn.execute("SELECT status FROM jobs WHERE id=?", (job_id,)).fetchone()
+                conn.execute("COMMIT")
+            except Exception:
+                conn.execute("ROLLBACK")
+                raise
+        return row[0] if row else None
 
     def mark_status(self, job_id: int, status: str):
         """Mark a job as the specified status."""
-        now = datetime.now(timezone.utc).isoformat()
         self.conn.execute(
-            "UPDATE jobs SET status=?, updated_at=? WHERE id=?",
-            (status, now, job_id)
+            f"UPDATE jobs SET status=?, updated_at={_NOW} WHERE id=?",
+            (status, job_id)
         )
 
     def retry_jobs(self):
         """Retry all failed or canceled or stopped jobs."""
-        now = datetime.now(timezone.utc).isoformat()
         self.conn.execute(
-            "UPDATE jobs SET status='PENDING', updated_at=? WHERE status='FAILED' or status='CANCELED' or status='STOPPED'",
-            (now,)
+            f"UPDATE jobs SET status='PENDING', updated_at={_NOW} WHERE status='FAILED' or status='CANCELED' or status='STOPPED'"
         )
 
     def count_running_jobs(self, job_type: str) -> int:
@@ -244,30 +435,19 @@ class State:
         rows = self.conn.execute(
             "SELECT id,type,job_name,url FROM jobs WHERE status='RUNNING'"
         ).fetchall()
-        out = []
-        for r in rows:
-            out.append({
-                "id": r[0], "type": r[1], "job_name": r[2], "url": r[3]
-            })
-        return out
+        return [dict(r) for r in rows]
 
     def update_job_info(self, job_id: int, job_name: str, link: str=""):
         """Update the job_name of a job."""
-        now = datetime.now(timezone.utc).isoformat()
         self.conn.execute(
-            "UPDATE jobs SET job_name=?, link=?, updated_at=? WHERE id=?",
-            (job_name, link, now, job_id)
+            f"UPDATE jobs SET job_name=?, link=?, updated_at={_NOW} WHERE id=?",
+            (job_name, link, job_id)
         )
 
     def fetch_all_urls(self) -> list[dict]:
         """Fetch all URLs in the jobs table."""
-        rows = self.conn.execute(
-            """SELECT url FROM jobs""",
-        ).fetchall()
-        out = []
-        for r in rows:
-            out.append(r[0])
-        return out
+        with self._ro_conn() as conn:
+            return [r[0] for r in conn.execute("SELECT url FROM jobs")]
 
     def check_url_exists(self, url: str) -> bool:
         """Check if a URL already exists in the jobs table."""
@@ -277,21 +457,54 @@ class State:
         ).fetchone()
         return row is not None
 
+    def filter_new_urls(self, urls: List[str]) -> List[str]:
+        """Return the URLs (deduplicated, in input order) that are not in the jobs table yet.
+        Uses an anti-join against idx_jobs_url instead of one lookup per URL."""
+        if not urls:
+            return []
+        conn = self.conn
+        conn.execute("CREATE TEMP TABLE IF NOT EXISTS incoming_urls(url TEXT PRIMARY KEY)")
+        conn.execute("BEGIN")
+        try:
+            conn.executemany("INSERT OR IGNORE INTO incoming_urls(url) VALUES(?)", ((u,) for u in urls))
+            rows = conn.execute(
+                """SELECT i.url FROM incoming_urls i
+                   WHERE NOT EXISTS (SELECT 1 FROM jobs j WHERE j.url = i.url)
+                   ORDER BY i.rowid"""
+            ).fetchall()
+            conn.execute("DELETE FROM incoming_urls")
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+        return [r[0] for r in rows]
+
     def add_nca(self, nca_id: int, nca_jurisdiction: str, nca_name: str):
         """Add a national component authority."""
-        cur = self.conn.cursor()
-        row = cur.execute(
-            "SELECT nca_id FROM ncas WHERE nca_id=? LIMIT 1",
-            (nca_id,)
-        ).fetchone()
-        if row:
-            return
-        cur.execute(
+        self.conn.execute(
             """INSERT INTO ncas(nca_id, nca_jurisdiction, nca_name)
-               VALUES(?,?,?)""",
+               VALUES(?,?,?) ON CONFLICT(nca_id) DO NOTHING""",
             (nca_id, nca_jurisdiction, nca_name)
         )
 
+    def add_ncas(self, ncas: List[Tuple[int, str, str]]):
+        """Add national component authorities from (nca_id, nca_jurisdiction, nca_name) rows,
+        keeping existing ones, in one transaction."""
+        if not ncas:
+            return
+        conn = self.conn
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            conn.executemany(
+                """INSERT INTO ncas(nca_id, nca_jurisdiction, nca_name)
+                   VALUES(?,?,?) ON CONFLICT(nca_id) DO NOTHING""",
+                ncas
+            )
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+
     def get_filtered_jobs(self, page: int = 1, per_page: int = 20,
                      job_type:str = None, status: str = None, jurisdiction: str = None,
                      date_from: str = None, date_to: str = None) -> Tuple[List[Dict], int]:
@@ -299,65 +512,63 @@ class State:
         Get filtered and paginated jobs joined with NCA data.
         Returns tuple of (jobs list, total count)
         """
-        query = """
-            SELECT j.url, j.type AS job_type, j.link AS job_link, j.status,
-                   CAST(j.validation_date AS TEXT) AS validation_date, j.crawl_count, j.last_crawl_file_count,
-                   CAST(j.created_at AS TEXT) AS created_at,
-                   CAST(j.updated_at AS TEXT) AS last_update,
-                   n.nca_jurisdiction, n.nca_name
-            FROM jobs j
-            LEFT JOIN ncas n ON j.nca_id = n.nca_id
-            WHERE 1=1
-        """
+        return self._cached_read(
+            ("jobs", page, per_page, job_type, status, jurisdiction, date_from, date_to),
+            lambda: self._get_filtered_jobs(page, per_page, job_type, status, jurisdiction, date_from, date_to))
+
+    def _get_filtered_jobs(self, page: int, per_page: int, job_type: str, status: str,
+                           jurisdiction: str, date_from: str, date_to: str) -> Tuple[List[Dict], int]:
+        where = ""
         params = []
         
         # Add filters
         if status:
-            query += " AND j.status = ?"
+            where += " AND j.status = ?"
             params.append(status)
         if job_type:
-            query += " AND j.type = ?"
+            where += " AND j.type = ?"
             params.append(job_type)
         if jurisdiction:
-            query += " AND n.nca_jurisdiction = ?"
+            where += " AND n.nca_jurisdiction = ?"
             params.append(jurisdiction)
         if date_from:
-            query += " AND j.validation_date >= ?"
+            where += " AND j.validation_date >= ?"
             params.append(date_from)
         if date_to:
-            query += " AND j.validation_date <= ?"
+            where += " AND j.validation_date <= ?"
             params.append(date_to)
 
-        # Get total count
-        count_query = f"SELECT COUNT(*) FROM ({query}) AS t"
-        total = self.conn.execute(count_query, params).fetchone()[0]
-
-        # Add pagination
-        query += " ORDER BY j.created_at DESC LIMIT ? OFFSET ?"
-        params.extend([per_page, (page - 1) * per_page])
-
-        rows = self.conn.execute(query, params).fetchall()
-        jobs = []
-        for row in rows:
-            jobs.append({
-                "url": row[0],
-                "type": row[1], 
-                "job_link": row[2],
-                "status": row[3],
-                "validation_date": row[4],
-                "crawl_count": row[5],
-                "file_count": row[6],
-                "created_at": row[7],
-                "last_update": row[8],
-                "jurisdiction": row[9],
-                "nca_name": row[10]
-            })
+        # count straight from jobs with the same filters, ncas is only joined when filtered on
+        count_query = "SELECT COUNT(*) FROM jobs j"
+        if jurisdiction:
+            count_query += " LEFT JOIN ncas n ON j.nca_id = n.nca_id"
+        count_query += " WHERE 1=1" + where
+
+        query = """
+            SELECT j.url, j.type AS type, j.link AS job_link, j.status,
+                   CAST(j.validation_date AS TEXT) AS validation_date, j.crawl_count,
+                   j.last_crawl_file_count AS file_count,
+                   CAST(j.created_at AS TEXT) AS created_at,
+                   CAST(j.updated_at AS TEXT) AS last_update,
+                   n.nca_jurisdiction AS jurisdiction, n.nca_name
+            FROM jobs j
+            LEFT JOIN ncas n ON j.nca_id = n.nca_id
+            WHERE 1=1""" + where + """
+            ORDER BY j.created_at DESC LIMIT ? OFFSET ?"""
+
+        with self._ro_conn() as conn:
+            total = conn.execute(count_query, params).fetchone()[0]
+            rows = conn.execute(query, params + [per_page, (page - 1) * per_page]).fetchall()
+        jobs = [dict(row) for row in rows]
         return jobs, total
 
     def get_jurisdictions(self) -> List[str]:
         """Get list of unique NCA jurisdictions"""
-        rows = self.conn.execute("SELECT DISTINCT nca_jurisdiction FROM ncas ORDER BY nca_jurisdiction").fetchall()
-        return [r[0] for r in rows]
+        def read():
+            with self._ro_conn() as conn:
+                rows = conn.execute("SELECT DISTINCT nca_jurisdiction FROM ncas ORDER BY nca_jurisdiction").fetchall()
+            return [r[0] for r in rows]
+        return self._cached_read(("jurisdictions",), read)
 
     def purge_all_crawl_jobs(self):
         """Permanently delete all failed crawl jobs."""
@@ -20,8 +20,7 @@ def update_crawl_configs(cfg: Config):
     cids = [c["id"] for c in crawl_configs]
     # any other config updates can be added to the config_update dict
     config_update = {"autoAddCollections": [btrix.collection_id]}
-    for cid in cids:
-        btrix.update_crawlconfig(cid, config_update)
+    btrix.update_crawlconfigs(cids, config_update)
 
 def add_crawl_to_collection(cfg: Config):
     btrix = BrowsertrixClient(
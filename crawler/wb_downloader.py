@@ -1,17 +1,33 @@
 from __future__ import annotations
 import os, time, re
+import functools
 from pathlib import Path
 from typing import List, Dict, Optional
 import logging
 import subprocess
+import selectors
+import threading
 import csv
 import uuid
-import tldextract
 
 log = logging.getLogger(__name__)
 
+# the status line is the last thing the download script prints
+STATUS_TAIL_BYTES = 4096
+# columns of the download status log
+STATUS_LOG_FIELDS = ["job_name", "desc", "url", "status", "output_dir", "file_count", "downloaded_at"]
+# "job_name: STATUS,files_downloaded" line printed by the download script
+_STATUS_RE = re.compile(r"^([\w-]+):\s*(\w+),(\d+)", re.M)
+
+@functools.lru_cache(maxsize=1)
+def _tld_extractor():
+    """Import tldextract on first use; its public suffix list is only needed for downloads."""
+    import tldextract
+    return tldextract.extract
+
+@functools.lru_cache(maxsize=4096)
 def registrable_domain(u: str) -> str:
-    ext = tldextract.extract(u)
+    ext = _tld_extractor()(u)
     return ".".join([ext.domain, ext.suffix]) if ext.suffix else ext.domain
 
 def write_csv_file(csv_file, data, fieldnames=None):
@@ -34,12 +50,17 @@ def write_csv_file(csv_file, data, fieldnames=None):
 
 def read_csv_file(csv_file, fieldnames=None):
     """read data from csv file"""
-    result = []
     try:
         with open(csv_file, 'r', newline='', encoding='utf-8') as file:
-            reader = csv.DictReader(file, fieldnames=fieldnames)
-            for row in reader:
-                result.append(row)
+            # plain csv.reader + zip, DictReader's per-row bookkeeping is the slow part
+            reader = csv.reader(file)
+            header = fieldnames or next(reader, None)
+            if not header:
+                return []
+            n = len(header)
+            pad = [None] * n
+            result = [dict(zip(header, row if len(row) >= n else row + pad[len(row):]))
+                      for row in reader if row]
     except FileNotFoundError:
         log.warning("File not found.")
         return []
@@ -59,6 +80,15 @@ class WBDownloader:
         self._status_log = output_base + os.sep + 'wb_download.csv'
         self._concurrency = concurrency
         self._jobs = {}
+        # pidfds of running jobs become readable when the process exits, so running
+        # jobs are answered from one select() instead of polling each process
+        self._selector = selectors.DefaultSelector() if hasattr(os, "pidfd_open") else None
+        self._pidfds: Dict[str, int] = {}
+        self._lock = threading.Lock()
+        # status log stays open for appends, opened on the first finished job
+        self._status_fh = None
+        self._status_writer = None
+        self._status_lock = threading.Lock()
         log.info("WBDownloader initialized with output_base=%s, concurrency=%d",
                  self._output_base, self._concurrency)
 
@@ -70,12 +100,73 @@ class WBDownloader:
         Returns the job name.
         """
         job_name = f"wb-{uuid.uuid4()}"
-        cmd = [self._downloader, url, str(self._concurrency), self.get_output_dir(url), job_name]
-        proc = subprocess.Popen(cmd, stdout=subprocess.PIPE, text=True)
+        output_dir = self.get_output_dir(url)
+        cmd = [self._downloader, url, str(self._concurrency), output_dir, job_name]
+        status_file = self._status_file(output_dir, job_name)
+        os.makedirs(os.path.dirname(status_file), exist_ok=True)
+        # stdout goes straight to a file: no pipe held open per running job,
+        # and the status line is read back from the file tail once the job exits
+        with open(status_file, "wb") as out:
+            # no preexec_fn/user/group args: keeps CPython on its vfork/posix_spawn path,
+            # avoiding a fork() page-table copy of this long-running process
+            proc = subprocess.Popen(cmd, stdout=out)
         self._jobs[job_name] = (url, job_desc, proc)
+        self._watch_exit(job_name, proc.pid)
         log.info("Started wayback download job for url %s", url)
         return job_name
 
+    @staticmethod
+    def _status_file(output_dir: str, job_name: str) -> str:
+        return output_dir + os.sep + "download_log" + os.sep + job_name + ".status"
+
+    @staticmethod
+    def _read_tail(path: str, size: int = STATUS_TAIL_BYTES) -> str:
+        """Read the last size bytes of a file, empty if it can't be read."""
+        try:
+            with open(path, "rb") as f:
+                f.seek(0, os.SEEK_END)
+                f.seek(max(0, f.tell() - size))
+                return f.read().decode("utf-8", errors="replace")
+        except OSError as e:
+            log.error("Error reading status file %s: %s", path, e)
+            return ""
+
+    def _watch_exit(self, job_name: str, pid: int) -> None:
+        """Register a pidfd for the job, falls back to polling if unsupported."""
+        if self._selector is None:
+            return
+        try:
+            fd = os.pidfd_open(pid)
+        except OSError as e:
+            log.debug("pidfd_open failed for %s, fall back to polling: %s", job_name, e)
+            return
+        with self._lock:
+            self._pidfds[job_name] = fd
+            self._selector.register(fd, selectors.EVENT_READ, job_name)
+
+    def _unwatch(self, job_name: str) -> None:
+        with self._lock:
+            fd = self._pidfds.pop(job_name, None)
+            if fd is not None:
+                self._selector.unregister(fd)
+                os.close(fd)
+
+    def _drain(self) -> None:
+        """Drop the pidfds of exited jobs, work is proportional to the jobs exited since the last call.
+        Caller must hold self._lock."""
+        for key, _ in self._selector.select(timeout=0):
+            self._selector.unregister(key.fd)
+            os.close(key.fd)
+            self._pidfds.pop(key.data, None)
+
+    def _is_running(self, job_name: str) -> bool:
+        """True if the job's process is known to be still running without polling it."""
+        with self._lock:
+            if job_name not in self._pidfds:
+                return False
+            self._drain()
+            return job_name in self._pidfds
+
     def get_job_status(self, job_name: str) -> str:
         """
         check job status.
@@ -85,39 +176,59 @@ class WBDownloader:
             log.error("Job not found: %s", job_name)
             return {"status":"FAILED"}
 
+        if self._is_running(job_name):
+            return {"status":"RUNNING"}
         proc = self._jobs[job_name][2]
         retcode = proc.poll()
         if retcode is None:
             return {"status":"RUNNING"}
+        self._unwatch(job_name)
 
         if retcode != 0:
             log.error("Job %s failed with return code %d", job_name, retcode)
             self._jobs.pop(job_name)
             return {"status":"FAILED"}
 
-        # find "job_name: STATUS,files_downloaded" in stdout
-        output = proc.stdout.read().strip()
-        match = re.search(rf"{re.escape(job_name)}:\s*(\w+),(\d+)", output)
+        # find "job_name: STATUS,files_downloaded" at the end of stdout
+        url = self._jobs[job_name][0]
+        output = self._read_tail(self._status_file(self.get_output_dir(url), job_name))
+        match = next((m for m in _STATUS_RE.finditer(output) if m.group(1) == job_name), None)
         if not match:
             log.error("Job %s finished but status line not found in output", job_name)
             self._jobs.pop(job_name)
             return {"status":"FAILED"}
-        status = match.group(1)
-        files_downloaded = match.group(2)
-        url = self._jobs[job_name][0]
+        status = match.group(2)
+        files_downloaded = match.group(3)
         job_desc = self._jobs[job_name][1]
         log.info("Job %s for url %s finished with status %s, files downloaded: %s",
                     job_name, url, status, files_downloaded)
-        write_csv_file(self._status_log, [{"job_name":job_name,
-                                           "desc":job_desc,
-                                            "url":url,
-                                            "status":status,
-                                            "output_dir": self.get_output_dir(url),
-                                            "file_count":files_downloaded,
-                                            "downloaded_at":time.strftime('%Y-%m-%d %H:%M:%S')}])
+        self._write_status({"job_name":job_name,
+                            "desc":job_desc,
+                            "url":url,
+                            "status":status,
+                            "output_dir": self.get_output_dir(url),
+                            "file_count":files_downloaded,
+                            "downloaded_at":time.strftime('%Y-%m-%d %H:%M:%S')})
         self._jobs.pop(job_name)
         return {"status":status, "crawl_count": 1, "file_count":int(files_downloaded)}
 
+    def _write_status(self, row: Dict) -> None:
+        """Append a row to the status log through the long-lived writer."""
+        with self._status_lock:
+            try:
+                if self._status_writer is None:
+                    os.makedirs(self._output_base, exist_ok=True)
+                    self._status_fh = open(self._status_log, 'a', newline='', encoding='utf-8')
+                    self._status_writer = csv.DictWriter(self._status_fh, fieldnames=STATUS_LOG_FIELDS)
+                    if self._status_fh.tell() == 0:
+                        self._status_writer.writeheader()
+                self._status_writer.writerow(row)
+                # rebuild_job_info reads this file back, don't leave rows in the buffer
+                self._status_fh.flush()
+            except Exception as e:
+                log.error("Error writing to CSV file %s: %s", self._status_log, e)
+                raise
+
     def rebuild_job_info(self) -> List[Dict]:
         """
         Get all download jobs info from status log.
@@ -129,5 +240,11 @@ class WBDownloader:
         for _, _, proc in self._jobs.values():
             if proc.poll() is None:
                 proc.terminate()
+        for job_name in list(self._pidfds):
+            self._unwatch(job_name)
         self._jobs.clear()
+        with self._status_lock:
+            if self._status_fh is not None:
+                self._status_fh.close()
+                self._status_fh = self._status_writer = None
         log.info("All jobs terminated.")
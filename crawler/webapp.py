@@ -4,17 +4,31 @@ import logging
 from .config import Config
 import argparse
 from flask import Flask, jsonify, request, Response, render_template
+from flask.json.provider import DefaultJSONProvider
 from datetime import datetime, timezone
 from .state import State
-from urllib.parse import urlencode
+try:
+    import orjson
+except ImportError:
+    orjson = None
 
 logging.basicConfig(level=logging.DEBUG, format="%(asctime)s %(levelname)s %(name)s: %(message)s")
 log = logging.getLogger(__name__)
 
+class OrjsonProvider(DefaultJSONProvider):
+    """Flask JSON provider backed by orjson, same sorted-key output as the default one."""
+    def dumps(self, obj, **kwargs) -> str:
+        return orjson.dumps(obj, default=self.default, option=orjson.OPT_SORT_KEYS).decode()
+
+    def loads(self, s, **kwargs):
+        return orjson.loads(s)
+
 def create_app(db_path: str, auth: dict | None = None) -> Flask:
     """Create and configure the Flask web application."""
     app = Flask(__name__)
     app.jinja_env.add_extension('jinja2.ext.do')
+    if orjson is not None:
+        app.json = OrjsonProvider(app)
     st = State(db_path)
     basic_auth = auth or {"enabled": False}
 
@@ -34,33 +48,33 @@ def create_app(db_path: str, auth: dict | None = None) -> Flask:
             return ''
         return value.strftime(format)
 
+    def _filters() -> dict:
+        """Read the job filter params from the query string."""
+        return {
+            'status': request.args.get('status'),
+            'job_type': request.args.get('job_type'),
+            'jurisdiction': request.args.get('jurisdiction'),
+            'date_from': request.args.get('date_from'),
+            'date_to': request.args.get('date_to')
+        }
+
+    def _jobs_page(page: int, filters: dict) -> dict:
+        """One page of filtered jobs, shared by the JSON API and the index page."""
+        jobs, total = st.get_filtered_jobs(page=page, **filters)
+        return {
+            "jobs": jobs,
+            "total": total,
+            "page": page,
+            "pages": (total + 19) // 20  # ceil(total/20)
+        }
+
     @app.route("/api/jobs")
     def api_jobs():
         if not _check_auth():
             return _auth_required()
-            
+
         page = int(request.args.get('page', 1))
-        status = request.args.get('status')
-        job_type = request.args.get('job_type')
-        jurisdiction = request.args.get('jurisdiction')
-        date_from = request.args.get('date_from')
-        date_to = request.args.get('date_to')
-        
-        jobs, total = st.get_filtered_jobs(
-            page=page,
-            status=status,
-            job_type=job_type,
-            jurisdiction=jurisdiction, 
-            date_from=date_from,
-            date_to=date_to
-        )
-        
-        return jsonify({
-            "jobs": jobs,
-            "total": total,
-            "page": page,
-            "pages": (total + 19) // 20  # ceil(total/20)
-        })
+        return jsonify(_jobs_page(page, _filters()))
 
     @app.route("/")
     def index():
@@ -69,21 +83,10 @@ def create_app(db_path: str, auth: dict | None = None) -> Flask:
             
         # Get filter params
         page = int(request.args.get('page', 1))
-        status = request.args.get('status')
-        job_type = request.args.get('job_type')
-        jurisdiction = request.args.get('jurisdiction')
-        date_from = request.args.get('date_from')
-        date_to = request.args.get('date_to')
-        
-        # Get filtered data
-        data = app.test_client().get("/api/jobs?" + urlencode({
-            'page': page,
-            'status': status,
-            'job_type': job_type,
-            'jurisdiction': jurisdiction,
-            'date_from': date_from, 
-            'date_to': date_to
-        })).get_json()
+        filters = _filters()
+
+        # Get filtered data, called directly rather than through /api/jobs
+        data = _jobs_page(page, filters)
         
         # Get jurisdictions for filter dropdown
         jurisdictions = st.get_jurisdictions()
@@ -95,13 +98,7 @@ def create_app(db_path: str, auth: dict | None = None) -> Flask:
             current_page=page,
             pages=data['pages'],
             jurisdictions=jurisdictions,
-            filters={
-                'status': status,
-                'job_type': job_type,
-                'jurisdiction': jurisdiction,
-                'date_from': date_from,
-                'date_to': date_to
-            },
+            filters=filters,
             now=datetime.now(timezone.utc).isoformat(timespec="seconds")+"Z"
         )
 
@@ -1,26 +1,60 @@
 from __future__ import annotations
+import os
 import sys
+import io
+import csv
+import gzip
 from playwright.sync_api import sync_playwright
 from pathlib import Path
 from pathlib import Path
 from datetime import date,datetime
 from typing import Optional
 import logging, requests
+import shutil
+import functools
+from concurrent.futures import ProcessPoolExecutor
+from itertools import repeat
+from requests.adapters import HTTPAdapter
 from typing import Dict, List, Tuple, Set
 from pathlib import Path
 import urlextract
-import pandas as pd
 import tldextract
 from urllib.parse import urlsplit, urlunsplit
 import re
 
 logging.basicConfig(level=logging.INFO)
 
+# shared session so repeated exports reuse the TLS connection
+_SESSION = requests.Session()
+_SESSION.mount("https://", HTTPAdapter(pool_maxsize=8))
+
 _SCHEME_RE = re.compile(r'^[a-zA-Z][a-zA-Z0-9+.+-]*://')
+_NETLOC_SPECIAL_RE = re.compile(r'[?\[\]]')
+_UNSAFE_CHARS_RE = re.compile(r'[\t\r\n]')
+
+def _is_normalized(raw: str) -> bool:
+    """True if normalize_url would return raw unchanged (lowercase http(s) scheme and host,
+    non-empty path, no fragment), so the urlsplit/urlunsplit round trip can be skipped."""
+    if raw.startswith("https://"):
+        rest = raw[8:]
+    elif raw.startswith("http://"):
+        rest = raw[7:]
+    else:
+        return False
+    slash = rest.find("/")
+    if slash <= 0 or "#" in rest or raw.endswith("?"):
+        return False
+    netloc = rest[:slash]
+    if netloc != netloc.lower() or _NETLOC_SPECIAL_RE.search(netloc):
+        return False
+    # urlsplit silently drops these anywhere in the URL
+    return not _UNSAFE_CHARS_RE.search(rest)
 
 def normalize_url(u: str) -> str:
     """Normalize: strip fragments, default scheme to https, lowercase scheme/host."""
     raw = (u or "").strip()
+    if _is_normalized(raw):
+        return raw
     if "#" in raw:
         raw = raw.split("#", 1)[0]
 
@@ -33,13 +67,23 @@ def normalize_url(u: str) -> str:
     path   = parts.path or "/"
     return urlunsplit((scheme, netloc, path, parts.query, ""))
 
-def registrable_domain(u: str) -> str:
-    ext = tldextract.extract(u)
+@functools.lru_cache(maxsize=8192)
+def _netloc_domain(netloc: str) -> str:
+    ext = tldextract.extract(netloc)
     return ".".join([ext.domain, ext.suffix]) if ext.suffix else ext.domain
 
-def url_start_with_domain(u: str) -> str:
+def registrable_domain(u: str) -> str:
+    # cache on the netloc, hosts repeat far more often than full URLs
+    try:
+        netloc = urlsplit(u).netloc
+    except ValueError:
+        netloc = ""
+    return _netloc_domain(netloc or u)
+
+def url_start_with_domain(u: str, domain: Optional[str] = None) -> str:
     """Extract the registrable domain and the URL starting from it."""
-    domain = registrable_domain(u)
+    if domain is None:
+        domain = registrable_domain(u)
     idx = u.find(domain)
     return u[idx:]
 
@@ -72,9 +116,9 @@ def fetch_iosco_csv(
 ) -> Path:
     csv_root.mkdir(parents=True, exist_ok=True)
     if start_date and end_date:
-        csv_name = f"iosco_export_{start_date.isoformat()}_to_{end_date.isoformat()}.csv"
+        csv_name = f"iosco_export_{start_date.isoformat()}_to_{end_date.isoformat()}.csv.gz"
     else:
-        csv_name = f"iosco_export_all_{date.today().isoformat()}.csv"
+        csv_name = f"iosco_export_all_{date.today().isoformat()}.csv.gz"
     out_path = csv_root / csv_name
 
     base_url = "https://www.iosco.org/i-scan/?export-to-csv"
@@ -87,16 +131,17 @@ def fetch_iosco_csv(
 
     logging.info("Fetching IOSCO CSV: %s params=%s timeout=%ss -> %s", base_url, params, timeout, out_path)
     try:
-        with requests.get(base_url, params=params, timeout=timeout, stream=True, headers={
+        with _SESSION.get(base_url, params=params, timeout=timeout, stream=True, headers={
             "User-Agent": "Mozilla/5.0 (compatible; FMA-Crawler/1.0)",
             "Accept": "text/csv, application/octet-stream; q=0.9, */*; q=0.1",
+            "Accept-Encoding": "identity",
         }) as resp:
             logging.debug("IOSCO response: status=%s content-type=%s", resp.status_code, resp.headers.get("Content-Type"))
             resp.raise_for_status()
-            with open(out_path, "wb") as f:
-                for chunk in resp.iter_content(chunk_size=65536):
-                    if chunk:
-                        f.write(chunk)
+            resp.raw.decode_content = True
+            # low compression level: the export compresses well even at level 1
+            with gzip.open(out_path, "wb", compresslevel=1) as f:
+                shutil.copyfileobj(resp.raw, f, length=1 << 20)
     except Exception:
         logging.exception("Failed to download IOSCO CSV")
         raise
@@ -166,17 +211,27 @@ def fetch_with_playwright(output: Path):
         if not resp.ok:
             raise RuntimeError(f"Download failed: {resp.status}")
 
-        csv_file = output / 'iosco_export.csv'
-        Path(csv_file).write_bytes(resp.body())
+        body = resp.body()
+        csv_file = output / 'iosco_export.csv.gz'
+        with gzip.open(csv_file, "wb", compresslevel=1) as f:
+            f.write(body)
         logging.info("CSV saved successfully.")
 
         browser.close()
         logging.info("Done.")
-        return csv_file
+        # hand the bytes back too, so the parser needn't re-read the file
+        return csv_file, body
 
 # tidy up raw URLs
+# every prefix fixed up by tidy_raw_url, most URLs match none of them
+_TIDY_PREFIX_RE = re.compile(
+    r"ttps://|www\.https://|https://\.|htttps://|httops://|htpps://|https://www\.\.|"
+    r"pagehttps://|pageshttps://|websitehttps://|websiteshttps://|andhttps://")
+
 def tidy_raw_url(rawURL: str) -> str:
     # custom data cleaning for observed errors in IOSCO URL data
+    if not _TIDY_PREFIX_RE.match(rawURL):
+        return normalize_url(rawURL)
     tidyURL = rawURL
     if tidyURL.startswith("ttps://"):
         tidyURL = "h" + tidyURL
@@ -211,73 +266,100 @@ manual_fixes = {
     12828: ['https://secure.capitalgmafx.com', 'https://trade.capitalgmafx.com', 'https://www.marketscfds.com', 'https://secure.marketscfds.com', 'https://ztrade24.com', 'https://secure.ztrade24.com']
 }
 
-def parse_url_cols(row) -> list:
+def parse_url_cols(row: list, idx: Dict[str, int]) -> list:
     def unique_by_domain(urls: list) -> list:
         # de-dup URLs by their registrable domain + path,
         # to avoid duplicates caused by minor variations (e.g. http vs https, www vs non-www, trailing slash, etc.)
         seen = set()
         unique_urls = []
-        for url in urls:
-            u = url_start_with_domain(url)
+        for url, domain in urls:
+            u = url_start_with_domain(url, domain)
             if u not in seen:
                 seen.add(u)
                 unique_urls.append(url)
         return unique_urls
 
     all_urls = []
-    nca_url = parse_url_field(str(getattr(row, NCA_URL_COL)))
+    nca_url = parse_url_field(row[idx[NCA_URL_COL]])
     nca_domain = registrable_domain(nca_url[0]) if nca_url else None
     # url column
-    all_urls.extend(parse_url_field(str(getattr(row, URL_COL))))
+    all_urls.extend(parse_url_field(row[idx[URL_COL]]))
     #commercial_name column
-    all_urls.extend(parse_url_field(str(getattr(row, COMNAME_COL))))
+    all_urls.extend(parse_url_field(row[idx[COMNAME_COL]]))
     #addInfoCol column
-    all_urls.extend(parse_url_field(str(getattr(row, ADDINFO_COL))))
+    all_urls.extend(parse_url_field(row[idx[ADDINFO_COL]]))
     # otherurlCol column, urls are separated by '|'
-    otherurls = getattr(row, OTHERURL_COL)
-    list_otherurls = str(otherurls).split("|")
+    list_otherurls = row[idx[OTHERURL_COL]].split("|")
     for url in list_otherurls:
-        all_urls.extend(parse_url_field(str(url)))
+        all_urls.extend(parse_url_field(url))
+    # look up each URL's domain once, it is used for both filtering and de-dup
+    url_domains = [(url, registrable_domain(url)) for url in all_urls]
     # filter out those are under the nca domain, as those are likely to be false positives (e.g. regulator's own website)
     if nca_domain:
-        all_urls = [url for url in all_urls if registrable_domain(url) != nca_domain]
-    return unique_by_domain(all_urls)
-
-def parse_csv_url_info(csv_path: Path):
-    """Parse URLs from the given CSV file, store them into csv"""
-    urls: dict[str, Tuple[int, int, str, str, str]] = {}
+        url_domains = [(url, domain) for url, domain in url_domains if domain != nca_domain]
+    return unique_by_domain(url_domains)
+
+def row_urls(row: list, idx: Dict[str, int]) -> list:
+    id = row[idx[ID_COL]]
+    fixed = manual_fixes.get(int(id)) if id.isdigit() else None
+    return fixed if fixed is not None else parse_url_cols(row, idx)
+
+# URL extraction is CPU bound, above this many rows it is spread over processes
+PARALLEL_MIN_ROWS = 20000
+
+def parse_rows_urls(rows: List[list], idx: Dict[str, int]) -> List[list]:
+    """Extract the URL list of each row, in row order."""
+    if len(rows) < PARALLEL_MIN_ROWS or (os.cpu_count() or 1) < 2:
+        return [row_urls(row, idx) for row in rows]
+    logging.info("Parsing URLs of %d rows with %d processes", len(rows), os.cpu_count())
+    with ProcessPoolExecutor() as ex:
+        return list(ex.map(row_urls, rows, repeat(idx, len(rows)), chunksize=512))
+
+def parse_csv_url_info(csv_path: Path, data: Optional[bytes] = None):
+    """Parse URLs from the given CSV file, store them into csv.
+    If data is given it is parsed instead of reading csv_path back from disk."""
+    urls: dict[str, Tuple[str, int, str, str, str]] = {}
     try:
-        csv_df = pd.read_csv(csv_path, dtype=str, low_memory=False)
-        for row in csv_df.itertuples():
-            id = getattr(row, ID_COL)
-            if id in manual_fixes:
-                url_list = manual_fixes[id]
-            else:
-                url_list = parse_url_cols(row)
-            nca_id = int(getattr(row, NCA_ID_COL))
-            nca_jurisdiction = getattr(row, NCA_JURIS_COL)
-            nca_name = getattr(row, NCA_NAME_COL)
-            validation_date = getattr(row, VALIDATION_DATE_COL)
-            attrs = (id, nca_id, nca_jurisdiction, nca_name, validation_date)
-            for url in url_list:
-                tidyURL = tidy_raw_url(url)
-                urls[tidyURL] = attrs
-    except pd.errors.EmptyDataError:
-        logging.warning("CSV file is empty: %s", csv_path)
-        return {}
+        if data is not None:
+            f = io.TextIOWrapper(io.BytesIO(data), encoding="utf-8-sig", newline="")
+        elif csv_path.suffix == ".gz":
+            f = gzip.open(csv_path, "rt", encoding="utf-8-sig", newline="")
+        else:
+            f = open(csv_path, "r", encoding="utf-8-sig", newline="")
+        with f:
+            reader = csv.reader(f)
+            header = next(reader, None)
+            if not header:
+                logging.warning("CSV file is empty: %s", csv_path)
+                return {}
+            # resolve column positions once instead of per row
+            idx = {name: i for i, name in enumerate(header)}
+            width = len(header)
+            id_i, nca_id_i = idx[ID_COL], idx[NCA_ID_COL]
+            juris_i, name_i, date_i = idx[NCA_JURIS_COL], idx[NCA_NAME_COL], idx[VALIDATION_DATE_COL]
+            rows = []
+            for row in reader:
+                if not row:
+                    continue
+                if len(row) < width:
+                    row += [""] * (width - len(row))
+                rows.append(row)
+            for row, url_list in zip(rows, parse_rows_urls(rows, idx)):
+                attrs = (row[id_i], int(row[nca_id_i]), row[juris_i], row[name_i], row[date_i])
+                for url in url_list:
+                    tidyURL = tidy_raw_url(url)
+                    urls[tidyURL] = attrs
     except Exception:
         logging.exception("Failed to read CSV: %s", csv_path)
         raise
 
     logging.info(f'Total urls parsed ({len(urls)}):')
     
-    # Write results to CSV file
-    output_df = pd.DataFrame([
-        {'url': url, ID_COL: attrs[0], NCA_ID_COL: attrs[1], NCA_JURIS_COL: attrs[2],
-         NCA_NAME_COL: attrs[3], VALIDATION_DATE_COL: attrs[4]}
-        for url, attrs in urls.items()
-    ])
-    output_df.to_csv(csv_path.parent / 'clean_urls.csv', index=False)
+    # Write results to CSV file, row by row
+    with open(csv_path.parent / 'clean_urls.csv', 'w', newline='', encoding='utf-8') as f:
+        writer = csv.writer(f, lineterminator='\n')
+        writer.writerow(['url', ID_COL, NCA_ID_COL, NCA_JURIS_COL, NCA_NAME_COL, VALIDATION_DATE_COL])
+        writer.writerows((url, *attrs) for url, attrs in urls.items())
     logging.info('Clean URLs saved to clean_urls.csv')
 
 if __name__ == "__main__":
@@ -289,7 +371,7 @@ if __name__ == "__main__":
     try:
         output_today = Path(base_dir) / f"{datetime.now().strftime('%Y%m%d')}"
         output_today.mkdir(parents=True, exist_ok=True)
-        csv_file = fetch_with_playwright(output_today)
-        parse_csv_url_info(csv_file)
+        csv_file, data = fetch_with_playwright(output_today)
+        parse_csv_url_info(csv_file, data)
     except Exception as e:
         logging.error(f"An error occurred {e}")
@@ -1,18 +1,31 @@
 from __future__ import annotations
 import sys
 import socket
+import functools
 from pathlib import Path
 import concurrent.futures as cf
-from typing import Tuple, Dict, List
+from collections import Counter
+from typing import Tuple, Dict, List, Set
 from urllib.parse import urlsplit, urlparse
 import requests
+from requests.adapters import HTTPAdapter
 import logging
-from datetime import datetime
+from datetime import datetime, timedelta
 import pandas as pd
 import traceback
 
 logging.basicConfig(level=logging.INFO)
 
+# shared across probe threads so hosts with several URLs reuse kept-alive connections
+_SESSION = requests.Session()
+_SESSION.mount("http://", HTTPAdapter(pool_connections=64, pool_maxsize=64))
+_SESSION.mount("https://", HTTPAdapter(pool_connections=64, pool_maxsize=64))
+# the body is never read, don't ask for compressed responses
+_SESSION.headers["Accept-Encoding"] = "identity"
+
+# a failed lookup is remembered, so the other URLs of a dead host skip both DNS and HTTP;
+# hosts that resolve are looked up once here and again by the HTTP client
+@functools.lru_cache(maxsize=4096)
 def resolve_host(host: str) -> bool:
     try:
         socket.getaddrinfo(host, None)
@@ -44,16 +57,47 @@ def probe_url(url: str, timeout: int) -> Tuple[str, str]:
         return url, "dead"
 
     try:
-        r = requests.get(url, stream=True, allow_redirects=True, timeout=timeout)
-        logging.debug("GET %s -> %s", url, r.status_code)
-        if check(r):
-            return url, "live"
+        # stream=True skips the body; closing the response releases the socket right away
+        with _SESSION.get(url, stream=True, allow_redirects=True, timeout=timeout) as r:
+            logging.debug("GET %s -> %s", url, r.status_code)
+            if check(r):
+                return url, "live"
     except requests.RequestException:
         pass
     return url, "dead"
 
 
-def classify_urls(urls: List[str], timeout: int = 60, treat_4xx_as_live: bool=True, max_workers: int = 30) -> Dict[str, str]:
+# clean_urls.csv column: True if the liveness was probed that day, False if inherited from its host
+PROBED_COL = "liveness_probed"
+
+def host_of(u: str) -> str:
+    try:
+        return urlsplit(u).hostname or ""
+    except ValueError:
+        return ""
+
+def recent_live_hosts(base_dir: Path, max_age_days: int) -> Set[str]:
+    """
+    Hosts with a URL probed as 'live' in the liveness results of the previous max_age_days days.
+    Results inherited from an earlier day are not counted, so a host is probed again
+    once its last real probe is older than max_age_days.
+    """
+    hosts: Set[str] = set()
+    today = datetime.now().date()
+    for days in range(1, max_age_days + 1):
+        url_file = Path(base_dir) / (today - timedelta(days=days)).strftime('%Y%m%d') / "clean_urls.csv"
+        if not url_file.exists():
+            continue
+        df = pd.read_csv(url_file, usecols=lambda c: c in ("url", "liveness", PROBED_COL))
+        # files without the marker can't tell probed from inherited results
+        if "liveness" not in df.columns or PROBED_COL not in df.columns:
+            continue
+        probed_live = (df["liveness"] == "live") & (df[PROBED_COL].astype(str) == "True")
+        hosts.update(host_of(u) for u in df.loc[probed_live, "url"])
+    hosts.discard("")
+    return hosts
+
+def classify_urls(urls: List[str], timeout: int = 60, treat_4xx_as_live: bool=True, max_workers: int = 64) -> Dict[str, str]:
     """
     Returns {url: 'live'|'dead'} based on the *best* observed status among its URLs.
     """
@@ -61,9 +105,7 @@ def classify_urls(urls: List[str], timeout: int = 60, treat_4xx_as_live: bool=Tr
     logging.info("Liveness: probing %d URLs (timeout=%ss, workers=%d)", len(urls), timeout, max_workers)
     results: Dict[str, str] = {}
     with cf.ThreadPoolExecutor(max_workers=max_workers) as ex:
-        futs = [ex.submit(probe_url, u, timeout) for u in urls]
-        for f in cf.as_completed(futs):
-            url, status = f.result()
+        for url, status in ex.map(functools.partial(probe_url, timeout=timeout), urls):
             results[url] = status
 
     # 4xx -> live (if configured)
@@ -71,12 +113,16 @@ def classify_urls(urls: List[str], timeout: int = 60, treat_4xx_as_live: bool=Tr
         # requests.head already followed redirects and we only labeled 5xx/network as dead.
         pass
 
-    logging.info("Liveness summary: live=%d dead=%d", sum(1 for s in results.values() if s=="live"),
-                                               sum(1 for s in results.values() if s=="dead"))
+    counts = Counter(results.values())
+    logging.info("Liveness summary: live=%d dead=%d", counts["live"], counts["dead"])
     return results
 
 # check livenss for all URLs daily,create a cron job for this
-def check_liveness(base_dir: Path):
+def check_liveness(base_dir: Path, reuse_days: int = 1):
+    """
+    URLs on a host that was live within the last reuse_days days are taken as live
+    without probing them again; 0 probes everything.
+    """
     output_today = Path(base_dir) / f"{datetime.now().strftime('%Y%m%d')}"
     if not output_today.exists():
         logging.info('CSV file has not been downloaded today!')
@@ -84,8 +130,14 @@ def check_liveness(base_dir: Path):
     url_file = output_today / "clean_urls.csv"
     url_df = pd.read_csv(url_file)
     urls = url_df['url'].tolist()
-    url_status = classify_urls(urls)
+    live_hosts = recent_live_hosts(base_dir, reuse_days) if reuse_days > 0 else set()
+    url_status = {u: "live" for u in urls if host_of(u) in live_hosts}
+    logging.info("Liveness: %d URLs on hosts live in the last %d day(s), not probed",
+                 len(url_status), reuse_days)
+    probed = classify_urls([u for u in urls if u not in url_status])
+    url_status.update(probed)
     url_df['liveness'] = url_df['url'].map(url_status)
+    url_df[PROBED_COL] = url_df['url'].isin(probed)
     url_df.to_csv(url_file, index=False)
     logging.info("Liveness check completed, results saved to %s", url_file)
 
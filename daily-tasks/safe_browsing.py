@@ -78,10 +78,12 @@ else:
  # use the same folder as the csv file
 if args.csv == "":
     newDirPath = Path(data_dir) / f"{datetime.now().strftime('%Y%m%d')}"
-    csv_f = newDirPath / 'iosco_export.csv'
-    if csv_f.exists():
-        # rely on daily task to download the csv file
-        args.csv = str(csv_f) # download_csv(newDirPath)
+    # the daily task stores the export gzip-compressed, older runs left it plain
+    for csv_f in (newDirPath / 'iosco_export.csv.gz', newDirPath / 'iosco_export.csv'):
+        if csv_f.exists():
+            # rely on daily task to download the csv file
+            args.csv = str(csv_f) # download_csv(newDirPath)
+            break
 else:
     newDirPath = Path(args.csv).parent
 
@@ -89,7 +91,8 @@ if args.csv == "":
     print('IOSCO csv file not downloaded!')
     sys.exit()
 
-newDirName = Path(args.csv).stem    # use csv file name as prefix
+csvPath = Path(args.csv)
+newDirName = (csvPath.with_suffix('') if csvPath.suffix == '.gz' else csvPath).stem    # use csv file name as prefix
 dateFragment = today.isoformat()
 
 #dataPath = Path.cwd().joinpath(data_dir)
@@ -150,6 +153,7 @@ rawURL = 'rawURL'
 TIDY_URL = 'tidyURL'
     
 ioscoCSVPath = Path(args.csv)
+# pandas infers gzip compression from the .gz suffix
 todaysCSV_df = pd.read_csv(ioscoCSVPath, dtype=str)
 
 if 'testDataSize' in globals():
@@ -452,7 +456,7 @@ def safeBrowsing(tupleList: list) -> dict:
         urlToCheck = tupleToCheck[3] # get the tidyURL
         URLList.append(urlToCheck)
     
-    uniqueURLList = list(set(URLList))
+    uniqueURLList = list(dict.fromkeys(URLList))
     threatEntries = [{"url": url} for url in uniqueURLList]
     
     headers = {"Content-type": "application/json"}